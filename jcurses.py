@@ -4,6 +4,141 @@ from time import sleep, monotonic
 ESCK = "\x1b["
 CONV = "utf-8"
 
+# Ready made output, so the hot paths don't allocate
+_ECHO = tuple(bytes((i,)) for i in range(128))  # Single ascii bytes
+_CLEAR = b"\x1b[2J\x1b[3J\x1b[H"
+_STALE_TIME = 3  # Seconds a late reply to a timed out query is still expected
+_HW = (b"\x1b[s\x1b[500B\x1b[500C", b"\x1b[6n", b"\x1b[u")
+
+
+class jcurses_query:
+    def __init__(self, kind, callback=None):
+        """
+        A terminal query waiting for its reply, see jcurses.query.
+        """
+        self.kind = kind
+        self.callback = callback
+        self.done = False
+        self.result = None
+        self.sent = None  # When it went out
+        self.stale = False  # Timed out, a late reply is eaten & thrown away
+
+    def resolve(self, result) -> None:
+        if self.stale:
+            return
+        self.result = result
+        self.done = True
+        if self.callback is not None:
+            self.callback(result)
+
+
+class jcurses_events:
+    def __init__(self, size=256, overflow="drop_old"):
+        """
+        Bounded queue of decoded keys (char_map names), allocated once.
+
+        overflow : What to do when full.
+            "drop_old" drops the oldest key, "drop_new" drops the incoming one,
+            "raise" raises OverflowError.
+        """
+        self._buf = [None] * size
+        self._head = 0
+        self._len = 0
+        self.overflow = overflow
+        self.dropped = 0  # Keys lost to overflow
+
+    def __len__(self) -> int:
+        return self._len
+
+    def _room(self, front) -> bool:
+        """
+        Make room according to the overflow policy.
+        Returns False if the incoming key is the one to drop.
+        """
+        size = len(self._buf)
+        if self._len < size:
+            return True
+        if self.overflow == "raise":
+            raise OverflowError("jcurses event queue full")
+        self.dropped += 1
+        if front:
+            # A pushed back key is older than everything queued
+            if self.overflow == "drop_old":
+                return False
+            self._len -= 1
+            self._buf[(self._head + self._len) % size] = None
+            return True
+        if self.overflow == "drop_new":
+            return False
+        self._buf[self._head] = None
+        self._head = (self._head + 1) % size
+        self._len -= 1
+        return True
+
+    def push(self, key) -> None:
+        """
+        Add a key at the end.
+        """
+        if self._room(False):
+            self._buf[(self._head + self._len) % len(self._buf)] = key
+            self._len += 1
+
+    def extend(self, keys) -> None:
+        for i in keys:
+            self.push(i)
+
+    def push_back(self, key) -> None:
+        """
+        Put a key back at the front, it will be the next one out.
+        """
+        if self._room(True):
+            self._head = (self._head - 1) % len(self._buf)
+            self._buf[self._head] = key
+            self._len += 1
+
+    def peek(self, n=0):
+        """
+        Look at the n-th key without taking it, None if there isn't one.
+        """
+        if n >= self._len:
+            return None
+        return self._buf[(self._head + n) % len(self._buf)]
+
+    def pop(self):
+        """
+        Take the next key, None if empty.
+        """
+        if not self._len:
+            return None
+        res = self._buf[self._head]
+        self._buf[self._head] = None
+        self._head = (self._head + 1) % len(self._buf)
+        self._len -= 1
+        return res
+
+    def find(self, key) -> int:
+        """
+        Position of the first such key, -1 if not queued.
+        """
+        for i in range(self._len):
+            if self._buf[(self._head + i) % len(self._buf)] == key:
+                return i
+        return -1
+
+    def take(self, n=None) -> list:
+        """
+        Take the first n keys (all by default) as a list.
+        """
+        if n is None or n > self._len:
+            n = self._len
+        res = []
+        for i in range(n):
+            res.append(self.pop())
+        return res
+
+    def clear(self) -> None:
+        while self._len:
+            self.pop()
 
 class jcurses:
     def __init__(self):
@@ -24,9 +159,9 @@ class jcurses:
         self.console = None
 
         # Temporary buffers that have higher priority over the real deal.
-        self.stdin_buf = None
+        self.stdin_buf = None  # Raw bytes, decoded by the next register_char
         self.stdout_buf = None  # Can be flushed to the real one, or returned
-        self.stdout_buf_b = bytes()  # Some have already been converted to bytes
+        self.stdout_buf_b = bytearray()  # Some have already been converted to bytes
         self.hold_stdout = False  # Do not flush stdout_buf
 
         """
@@ -52,6 +187,19 @@ class jcurses:
         self.overflow_enabled = False
         self._sw_cursor_tick = False
         self._sw_cursor_time = 0
+        self._sw_curs_b = bytearray(b" \010")
+
+        # ESC[nC & ESC[nD for n up to the line length, filled in on first use
+        self._csi_tbl = {67: [None] * 256, 68: [None] * 256}
+
+        # Decoded keys not consumed yet, they survive across program / input calls
+        self.events = jcurses_events()
+
+        # Terminal queries, not sent yet & waiting for a reply
+        self._query_new = []
+        self._queries = []
+        self._query_out = bytes()
+        self._csi = ""
 
     def check_activity(self) -> bool:
         self._active = hasattr(self.console, "connected")
@@ -78,8 +226,8 @@ class jcurses:
             if to_stdout:
                 self.console.write(self.stdout_buf_b)
             else:
-                data = self.stdout_buf_b
-            self.stdout_buf_b = bytes()
+                data = bytes(self.stdout_buf_b)
+            self.stdout_buf_b[:] = b""
             if to_stdout:
                 del data
                 return None
@@ -88,6 +236,16 @@ class jcurses:
         else:
             return None
 
+    def drain(self, timeout=None) -> bool:
+        """
+        Flush & wait until the console has written everything out.
+        Only matters with a queued console, like jcurses_writer.
+        """
+        self.flush_writes()
+        if hasattr(self.console, "drain"):
+            return self.console.drain(timeout)
+        return True
+
     def update_rem(self) -> None:
         if ("permit_pos" not in self.trigger_dict) or self.trigger_dict["permit_pos"]:
             tmppos = self.detect_pos()
@@ -98,7 +256,10 @@ class jcurses:
         # Internal
         self.stdin_buf = None
         self.stdout_buf = None
-        self.stdout_buf_b = bytes()
+        self.stdout_buf_b[:] = b""
+        self.events.clear()
+        # Late replies go away along with the input
+        self._queries = [q for q in self._queries if not q.stale]
 
         # External
         if self.console.in_waiting:
@@ -126,10 +287,7 @@ class jcurses:
                     self.buf[
                         1
                     ] = f"{self.buf[1][:insertion_pos]}{self.buf[1][insertion_pos + 1 :]}"  # backend
-                    self.stdout_buf_b += bytes(
-                        f"{self.buf[1][insertion_pos:]} {ESCK}{str(len(self.buf[1][insertion_pos:]) + 1)}D",
-                        CONV,
-                    )  # frontend
+                    self._redraw_tail(insertion_pos)  # frontend
                     del insertion_pos
         self._auto_flush()
 
@@ -144,7 +302,7 @@ class jcurses:
         df = lb - self.focus
         if df > 0:
             self.focus = lb
-        self.stdout_buf_b += b"\010" * df
+            self._csi_n(df, 68)
         self._auto_flush()
 
     def end(self) -> None:
@@ -154,7 +312,7 @@ class jcurses:
         self._flush_to_bytes()
         if self._sw_cursor_tick:
             self._sw_curs_restore()
-        self.stdout_buf_b += self.buf[1][len(self.buf[1])-self.focus:]
+        self.stdout_buf_b += bytes(self.buf[1][len(self.buf[1]) - self.focus :], CONV)
         self.focus = 0
         self._auto_flush()
 
@@ -174,9 +332,9 @@ class jcurses:
             if len(self.buf[1]) > 0 and self.focus:
                 if self.focus == len(self.buf[1]):
                     self.buf[1] = self.buf[1][1:]
-                    self.stdout_buf_b += bytes(
-                        f"{self.buf[1]} " + "\010" * self.focus, CONV
-                    )
+                    self.stdout_buf_b += bytes(self.buf[1], CONV)
+                    self.stdout_buf_b.append(32)
+                    self._csi_n(self.focus, 68)
                     self.spacerem += 1
                     self.focus -= 1
                 else:
@@ -184,10 +342,7 @@ class jcurses:
                     self.buf[
                         1
                     ] = f"{self.buf[1][:insertion_pos]}{self.buf[1][insertion_pos + 1 :]}"  # backend
-                    self.stdout_buf_b += bytes(
-                        f"{self.buf[1][insertion_pos:]} {ESCK}{str(len(self.buf[1][insertion_pos:]) + 1)}D",
-                        CONV,
-                    )  # frontend
+                    self._redraw_tail(insertion_pos)  # frontend
                     self.spacerem += 1
                     self.focus -= 1
                     del insertion_pos
@@ -204,7 +359,7 @@ class jcurses:
         so doing both, just to be safe.
         """
         self._flush_to_bytes()
-        self.stdout_buf_b += bytes(f"{ESCK}2J{ESCK}3J{ESCK}H", CONV)
+        self.stdout_buf_b += _CLEAR
         self._auto_flush()
 
     def clear_line(self, direct: bool = False) -> None:
@@ -249,93 +404,147 @@ class jcurses:
         """
         Detect terminal size. Returns [rows, collumns] on success.
         If the terminal is unavailable or unresponsive, return False.
+
+        The cursor position is asked in the same write, to update spacerem.
         """
         if hasattr(self.console, "size"):
             return self.console.size
         res = False
-        strr = ""
-        cc = None
-        resi = []
-        prt = None
         try:
-            # clearing stdin in case of fast pasting
-            self.rem_gib()
-
-            for i in range(3):
-                self.get_hw(i)
-
-            tm = monotonic()
-            while (monotonic() - tm < timeout) and (len(resi) != 2):
-                if self.console.in_waiting:
-                    cc = str(self.console.read(1), CONV)
-                    if cc == "\x1b":
-                        cc = str(self.console.read(1), CONV)
-                        if cc == "[":
-                            prt = ""
-                            while monotonic() - tm < timeout:
-                                cc = str(self.console.read(1), CONV)
-                                if cc.isdigit():
-                                    prt += cc
-                                elif cc == ";":
-                                    resi.append(int(prt))
-                                    break
-                                else:
-                                    tm += 2 * timeout
-                            prt = ""
-                            while monotonic() - tm < timeout:
-                                cc = str(self.console.read(1), CONV)
-                                if cc.isdigit():
-                                    prt += cc
-                                elif cc == "R":
-                                    resi.append(int(prt))
-                                    break
-                                else:
-                                    tm += 2 * timeout
-            if len(resi) == 2:
-                res = resi
-                # Let's also update the move bookmarks.
-                self.ctx_dict["bottom_left"] = [res[0], 1]
-                self.ctx_dict["line_len"] = res[1]
-                if ("permit_pos" not in self.trigger_dict) or self.trigger_dict[
-                    "permit_pos"
-                ]:
-                    tmppos = self.detect_pos()
-                    if tmppos is not None:
-                        self.spacerem = res[1] - tmppos[1]
-            else:
-                self.console.reset_input_buffer()
+            sz = self.query("size")
+            pos = self.query("pos") if self._permit_pos() else None
+            self.query_wait(timeout, [sz] if pos is None else [sz, pos])
+            if sz.done:
+                res = sz.result
+                self._set_size(res, pos.result if pos is not None else None)
+            del sz, pos
         except KeyboardInterrupt:
             pass
         except:
             pass
-        del strr, cc, resi, prt, timeout
+        del timeout
         return res
 
     def detect_pos(self) -> list:
         """
         detect cursor position, returns [rows, collumns]
         """
+        q = self.query("pos")
+        self.query_wait(1, [q])
+        return q.result
 
-        res = None
-        st = monotonic()
-        while monotonic()-st < 1:
-            try:
-                strr = ""
-
-                # clearing stdin in case of fast pasting
-                self.rem_gib()
-
-                self.get_hw(1)  # we need an empty stdin for this
-                while (not strr.endswith("R")) and monotonic()-st < 1:
-                    strr += str(self.console.read(1), CONV)
-                strr = strr[2:-1]  # this is critical as find will break with <esc>.
-                res = [int(strr[: strr.find(";")]), int(strr[strr.find(";") + 1 :])]
-                del strr
-                break
-            except ValueError:
-                pass
+    def probe(self, timeout=0.3) -> dict:
+        """
+        Ask size, cursor position & device attributes in a single write.
+        Returns a dict with "size", "pos" & "da", None for what didn't answer.
+        """
+        qs = {"pos": self.query("pos"), "da": self.query("da")}
+        if hasattr(self.console, "size"):
+            qs["size"] = None
+        else:
+            qs["size"] = self.query("size")
+        self.query_wait(timeout, [i for i in qs.values() if i is not None])
+        res = {}
+        for i in qs:
+            res[i] = qs[i].result if qs[i] is not None else None
+        if res["size"] is None and hasattr(self.console, "size"):
+            res["size"] = self.console.size
+        if res["size"] is not None:
+            self._set_size(res["size"], res["pos"])
+        del qs
+        return res
+
+    def query(self, kind, callback=None):
+        """
+        Queue a terminal query, it is sent along with the others by query_send.
+
+        kind can be "pos" (cursor position), "size" (terminal size)
+        or "da" (device attributes).
+        The reply is picked out of the input stream by register_char,
+        the callback gets the result once it arrives.
+        """
+        q = jcurses_query(kind, callback)
+        if kind == "pos":
+            self._query_out += _HW[1]
+        elif kind == "size":
+            # save pos, goto the end, ask position, go back
+            self._query_out += _HW[0] + _HW[1] + _HW[2]
+        elif kind == "da":
+            self._query_out += b"\x1b[c"
+        else:
+            raise ValueError(f"Unknown query: {kind}")
+        self._query_new.append(q)
+        return q
+
+    def query_send(self) -> list:
+        """
+        Send all queued queries in one write.
+        Returns the queries that were sent.
+        """
+        res = self._query_new
+        self._query_new = []
+        if len(self._query_out):
+            self.flush_writes()
+            self.console.write(self._query_out)
+            self._query_out = bytes()
+        tm = monotonic()
+
+        # Timed out ones we gave up waiting for a late reply to
+        for q in self._queries[:]:
+            if q.stale and tm - q.sent > _STALE_TIME:
+                self._queries.remove(q)
+
+        for q in res:
+            q.sent = tm
+        self._queries += res
         return res
 
+    def query_wait(self, timeout=0.3, queries=None) -> bool:
+        """
+        Send the queued queries & wait for the replies to queries,
+        by default the ones just sent. Other queries stay pending.
+        Keys typed meanwhile are kept for the next register_char.
+
+        Returns False if some did not answer in time, their replies,
+        should they still come, are thrown away.
+        """
+        sent = self.query_send()
+        if queries is None:
+            queries = sent
+        self.drain(timeout)
+        tm = monotonic()
+        while monotonic() - tm < timeout:
+            for q in queries:
+                if not q.done:
+                    break
+            else:
+                return True
+            if self.console.in_waiting or self.stdin_buf is not None:
+                self._pump()
+            else:
+                sleep(0.001)
+        for q in queries:
+            if not q.done:
+                q.stale = True
+        return False
+
+    def _permit_pos(self) -> bool:
+        return (
+            (self.trigger_dict is None)
+            or ("permit_pos" not in self.trigger_dict)
+            or self.trigger_dict["permit_pos"]
+        )
+
+    def _set_size(self, size, pos=None) -> None:
+        # Let's also update the move bookmarks.
+        self.ctx_dict["bottom_left"] = [size[0], 1]
+        self.ctx_dict["line_len"] = size[1]
+        for i in self._csi_tbl.values():
+            if len(i) <= size[1]:
+                i.extend([None] * (size[1] + 1 - len(i)))
+        if pos is not None:
+            self.spacerem = size[1] - pos[1]
+
     def rem_gib(self) -> None:
         """
         remove gibberrish from stdin when we need to read ansi escape codes
@@ -366,15 +575,9 @@ class jcurses:
         """
         Used to send and recieve, position ansi requests
         """
-        if act is 0:
-            # save pos & goto the end
-            self.console.write(bytes(f"{ESCK}s{ESCK}500B{ESCK}500C", CONV))
-        elif act is 1:
-            # ask position
-            self.console.write(bytes(f"{ESCK}6n", CONV))
-        elif act is 2:
-            # go back to original position
-            self.console.write(bytes(f"{ESCK}u", CONV))
+        # 0: save pos & goto the end, 1: ask position, 2: go back to original position
+        if act in {0, 1, 2}:
+            self.console.write(_HW[act])
 
     def training(self, opt=False) -> None:
         sleep(3)
@@ -398,61 +601,103 @@ class jcurses:
         it will all come in one nice bundle.
         This is to improve performance & compatibility with advanced keyboard features.
 
+        Keys still in the event queue, typed during terminal queries
+        or left in stdin_buf by rem_gib, come first.
+        Put back what you don't use with self.events.push_back.
+
         You need to loop this in a while true.
         """
-        stack = []
+        self._pump()
+        return self.events.take()
+
+    def _pump(self) -> None:
+        """
+        Decode all pending input into the event queue.
+        """
+        if self.stdin_buf is not None:
+            self.events.extend(self._decode(self.stdin_buf))
+            self.stdin_buf = None
         n = self.console.in_waiting
-        if n or self.stdin_buf is not None:
-            i = None
-            if self.stdin_buf is not None:
-                i = self.stdin_buf
+        if n:
+            self.events.extend(self._decode(self.console.read(n)))
+
+    def _decode(self, data) -> list:
+        """
+        Turn raw input into key names.
+        Terminal query replies are taken out & handed to their query.
+        Partial escape sequences carry over to the next call.
+        """
+        stack = []
+        for charr in data:
+            # Check for alt or process
+            if self.text_stepping is 0:
+                if charr == 27:
+                    self.text_stepping = 1
+                elif charr in char_map:
+                    stack.append(char_map[charr])
+
+            # Check skipped alt
+            elif self.text_stepping is 1:
+                if charr != 91:
+                    self.text_stepping = 0
+                    if charr in char_map:
+                        stack.extend(["alt", char_map[charr]])
+                else:
+                    self.text_stepping = 2
+                    self._csi = ""
+
+            # Inside of an escape sequence, the arrow keys, the six above & replies
             else:
-                self.stdin_buf = self.console.read(n)
-                i = self.stdin_buf
-                try:
-                    for charr in i:
-                        # Check for alt or process
-                        if self.text_stepping is 0:
-                            if charr != 27:
-                                stack.append(char_map[charr])
-                            else:
-                                self.text_stepping = 1
-
-                        # Check skipped alt
-                        elif self.text_stepping is 1:
-                            if charr != 91:
-                                self.text_stepping = 0
-                                stack.extend(["alt", char_map[charr]])
-                            else:
-                                self.text_stepping = 2
-
-                        # the arrow keys and the six above
-                        elif self.text_stepping is 2:
-                            self.text_stepping = 3
-                            stack.append(char_map[300 + charr])
-
-                        else:
-                            if charr == 126:  # garbage
-                                self.text_stepping = 0
-                            elif charr == 27:  # new special
-                                self.text_stepping = 1
-                            else:  # other
-                                stack.append(char_map[charr])
-                except KeyError:
+                if 48 <= charr <= 63 and len(self._csi) < 16:  # parameters
+                    self._csi += chr(charr)
+                else:
                     self.text_stepping = 0
-            self.stdin_buf = None
+                    if 64 <= charr <= 126:
+                        key = self._csi_done(self._csi, charr)
+                        if key is not None:
+                            stack.append(key)
         return stack
 
+    def _csi_done(self, params, final):
+        """
+        A whole escape sequence came in, returns the key or None.
+        """
+        if final == 82 and ";" in params:  # R, a position reply
+            for q in self._queries:
+                if q.kind in {"pos", "size"}:
+                    try:
+                        res = [int(i) for i in params.split(";")]
+                    except ValueError:
+                        return None
+                    self._queries.remove(q)
+                    q.resolve(res)
+                    return None
+        elif final == 99 and params.startswith("?"):  # c, device attributes
+            for q in self._queries:
+                if q.kind == "da":
+                    self._queries.remove(q)
+                    q.resolve([int(i) for i in params[1:].split(";") if i.isdigit()])
+                    return None
+            return None
+        if final == 126:  # ~, keys like del
+            if len(params) == 1:
+                return char_map.get(300 + ord(params))
+            return None
+        if (not params) or params.startswith("1;"):  # also with modifiers
+            return char_map.get(300 + final)
+        return None
+
     def is_interrupted(self) -> bool:
-        res = False
-        tempstack = self.register_char()
-        if tempstack is not None:
-            tempstack.reverse()
-            if "ctrlC" in tempstack:
-                res = True
-                # We abandon this buffer
-        del tempstack
-        return res
+        """
+        Check for a ctrlC without eating the other keys.
+        Keys up to the ctrlC are abandoned, the rest stay queued.
+        """
+        self._pump()
+        n = self.events.find("ctrlC")
+        if n == -1:
+            return False
+        self.events.take(n + 1)
+        return True
 
     def input(self, prefix="") -> str:
         res = ""
@@ -554,8 +799,9 @@ class jcurses:
                                     if self.focus:
                                         if self._sw_cursor_tick:
                                             self._sw_curs_restore()
-                                        self.console.write(self.buf[1][len(self.buf[1])-self.focus:])
-                                        self.console.write(b"\010" * (self.focus - 1))
+                                        # Rewriting the char under us steps right
+                                        c = len(self.buf[1]) - self.focus
+                                        self.console.write(self._echo(self.buf[1][c]))
                                         self.focus -= 1
                                 elif self.trigger_dict["rest"] == "stack" and (
                                     self.trigger_dict["rest_a"] == "common"
@@ -569,16 +815,12 @@ class jcurses:
                                             "all",
                                         }:
                                             if not self.overflow_check():
-                                                self.console.write(bytes(i, CONV))
+                                                self.console.write(self._echo(i))
                                                 self.spacerem -= len(i)
                                                 self.buf[1] += i
                                             else:
-                                                if self.stdin_buf is None:
-                                                    self.stdin_buf = i
-                                                else:
-                                                    self.stdin_buf += i
-                                                while tempstack:
-                                                    self.stdin_buf += tempstack.pop()
+                                                # Keep it & the rest for next time
+                                                tempstack.append(i)
                                                 self.softquit = True
                                                 try:
                                                     self.buf[0] = self.trigger_dict[
@@ -598,18 +840,20 @@ class jcurses:
                                             + self.buf[1][insertion_pos:]
                                         )
 
-                                        # frontend insertion
-                                        for d in self.buf[1][insertion_pos:]:
-                                            self.console.write(bytes(d, CONV))
-
-                                        steps_in = len(self.buf[1][insertion_pos:])
-
-                                        for e in range(steps_in - 1):
-                                            self.console.write(b"\010")
+                                        # frontend insertion, in a single write
+                                        self._flush_to_bytes()
+                                        self.stdout_buf_b += bytes(
+                                            self.buf[1][insertion_pos:], CONV
+                                        )
+                                        self._csi_n(self.focus, 68)
+                                        self.flush_writes()
 
-                                        del steps_in, insertion_pos
+                                        del insertion_pos
                                 if nb and not tempstack:
                                     self.softquit = True
+                            # Whatever we didn't get to stays queued, in order
+                            while tempstack:
+                                self.events.push_back(tempstack.pop(0))
                     except KeyboardInterrupt:
                         self.buf[0] = self.trigger_dict["ctrlC"]
                         self.softquit = True
@@ -634,7 +878,7 @@ class jcurses:
             self.trigger_dict["prefix"].replace("\n", "\n\r") + self.buf[1], CONV
         )
         if self.focus:
-            self.stdout_buf_b += bytes(f"{ESCK}{self.focus}D", CONV)
+            self._csi_n(self.focus, 68)
         if self.overflow_enabled:
             self.update_rem()
         self._auto_flush()
@@ -648,25 +892,24 @@ class jcurses:
             self._sw_curs_restore()
         self._flush_to_bytes()
         if ctx is None:
-            x, y = max(1, x), max(1, y)
-            self.stdout_buf_b += bytes(f"{ESCK}{y};{x}H", CONV)
+            self._goto(max(1, y), max(1, x))
         else:
             thectx = self.ctx_dict[ctx]
-            self.stdout_buf_b += bytes(f"{ESCK}{thectx[1]};{thectx[0]}H", CONV)
+            self._goto(thectx[1], thectx[0])
 
             # out of bounds check for up and down
             if x + thectx[0] > 0:
                 if thectx[0] > 0:
-                    self.stdout_buf_b += bytes(f"{ESCK}{thectx[0]}B", CONV)
+                    self._csi_n(thectx[0], 66)
                 else:
-                    self.stdout_buf_b += bytes(f"{ESCK}{-thectx[0]}A", CONV)
+                    self._csi_n(-thectx[0], 65)
 
             # out of bounds check for right and left
             if y + thectx[1] > 0:
                 if thectx[1] > 0:
-                    self.stdout_buf_b += bytes(f"{ESCK}{thectx[1]}C", CONV)
+                    self._csi_n(thectx[1], 67)
                 else:  # left
-                    self.stdout_buf_b += bytes(f"{ESCK}{-thectx[1]}D", CONV)
+                    self._csi_n(-thectx[1], 68)
 
             del thectx
             self._auto_flush()
@@ -695,10 +938,65 @@ class jcurses:
         if not self.hold_stdout:
             self.flush_writes()
 
+    def _num(self, n) -> None:
+        """
+        Append n in decimal to stdout_buf_b, without making a str.
+        """
+        buf = self.stdout_buf_b
+        if n < 0:
+            buf.append(45)
+            n = -n
+        d = 1
+        while d * 10 <= n:
+            d *= 10
+        while d:
+            buf.append(48 + (n // d) % 10)
+            d //= 10
+
+    def _csi_n(self, n, final) -> None:
+        """
+        Append ESC[<n><final> to stdout_buf_b, cached for C & D.
+        """
+        tbl = self._csi_tbl.get(final)
+        if tbl is not None and 0 <= n < len(tbl):
+            res = tbl[n]
+            if res is None:
+                res = tbl[n] = bytes(f"{ESCK}{n}{chr(final)}", CONV)
+            self.stdout_buf_b += res
+        else:
+            self.stdout_buf_b += b"\x1b["
+            self._num(n)
+            self.stdout_buf_b.append(final)
+
+    def _goto(self, row, col) -> None:
+        self.stdout_buf_b += b"\x1b["
+        self._num(row)
+        self.stdout_buf_b.append(59)
+        self._num(col)
+        self.stdout_buf_b.append(72)
+
+    def _redraw_tail(self, pos) -> None:
+        """
+        Rewrite buf from pos on, blank the freed cell & step back.
+        """
+        self.stdout_buf_b += bytes(self.buf[1][pos:], CONV)
+        self.stdout_buf_b.append(32)
+        self._csi_n(len(self.buf[1]) - pos + 1, 68)
+
+    def _echo(self, c) -> bytes:
+        if len(c) == 1 and ord(c) < 128:
+            return _ECHO[ord(c)]
+        return bytes(c, CONV)
+
     def _sw_curs_restore(self) -> None:
-        replc = b" "
+        replc = self._sw_curs_b
+        replc[0] = 32
         if self.focus:
-            replc = bytes(self.buf[1][len(self.buf[1])-self.focus], CONV)
-        self.console.write(replc + b"\010")
+            c = self.buf[1][len(self.buf[1]) - self.focus]
+            if ord(c) < 128:
+                replc[0] = ord(c)
+            else:
+                replc = bytes(c, CONV) + b"\010"
+        self.console.write(replc)
         self._sw_cursor_tick = False
         self._sw_cursor_time = monotonic()
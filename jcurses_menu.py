@@ -0,0 +1,196 @@
+from jcurses import ESCK
+from time import sleep
+
+
+class jcurses_menu:
+    def __init__(self, jcurses, items, top=1, left=1, rows=10, width=None):
+        """
+        A list / menu widget.
+
+        items can be any sequence (list, tuple, range, ...), it is never copied.
+        Only the visible slice is ever converted to text & drawn.
+        If the sequence changes length, hand it over again with set_items.
+
+        top, left : Where to draw, 1-based terminal coordinates.
+        rows      : How many item rows are visible. One more row is used for the filter.
+        width     : Row width, defaults to what's left of the line (80 columns if
+                    the terminal doesn't tell).
+        """
+        self.jc = jcurses
+        self.top = top
+        self.left = left
+        self.rows = rows
+        if width is None:
+            # line_len is only a placeholder until the terminal was asked
+            size = self.jc.detect_size()
+            width = (size[1] if size else 80) - left + 1
+        self.width = max(1, width)
+
+        self._alt = False  # The next key came along with alt
+
+        # What is currently on screen, None forces a redraw of that row
+        self._drawn = [None] * (rows + 1)
+        self.set_items(items)
+
+    def set_items(self, items) -> None:
+        """
+        Replace the items, dropping the filter & selection.
+        """
+        self.items = items
+        self.flt = ""  # Current filter text
+        self.match = range(len(items))  # Indexes into items that pass the filter
+        self._match_stack = []  # Previous results, so bck doesn't rescan
+        self.sel = 0  # Selected position in match
+        self.scroll = 0  # First visible position in match
+
+    def _text(self, idx) -> str:
+        return str(self.items[idx])
+
+    def _row_text(self, text) -> str:
+        """
+        Make text safe to draw on a single row, control chars would break the layout.
+        """
+        for i in text:
+            if ord(i) < 32 or ord(i) == 127:
+                text = "".join(
+                    "?" if (ord(c) < 32 or ord(c) == 127) else c for c in text
+                )
+                break
+        return text[: self.width]
+
+    def set_filter(self, flt) -> None:
+        """
+        Set the filter text.
+        If the new filter extends the old one, only the previous matches are scanned.
+        """
+        if flt == self.flt:
+            return
+        if flt.startswith(self.flt):
+            # Narrow down, one step per added char, so that bck can step back.
+            for i in range(len(self.flt), len(flt)):
+                self._match_stack.append(self.match)
+                needle = flt[: i + 1].lower()
+                self.match = [j for j in self.match if needle in self._text(j).lower()]
+        else:
+            # Step back to the longest cached prefix and narrow from there.
+            while self._match_stack and not flt.startswith(self.flt):
+                self.match = self._match_stack.pop()
+                self.flt = self.flt[:-1]
+            if not flt.startswith(self.flt):
+                self.flt = ""
+                self.match = range(len(self.items))
+            self.set_filter(flt)
+        self.flt = flt
+        self.sel = 0
+        self.scroll = 0
+
+    def _visible(self) -> None:
+        """
+        Keep the selection on screen.
+        """
+        if self.sel < self.scroll:
+            self.scroll = self.sel
+        elif self.sel >= self.scroll + self.rows:
+            self.scroll = self.sel - self.rows + 1
+
+    def selected(self):
+        """
+        Index into items of the current selection, None if nothing matches.
+        """
+        if not len(self.match):
+            return None
+        return self.match[self.sel]
+
+    def key(self, k):
+        """
+        Process a single key from register_char.
+        Returns the selected index on enter, -1 on ctrlC, otherwise None.
+        """
+        if k == "alt":
+            self._alt = True
+            return None
+        if self._alt:
+            # Alt combos are not ours
+            self._alt = False
+            return None
+        n = len(self.match)
+        if k == "enter":
+            if n:
+                return self.match[self.sel]
+        elif k == "ctrlC":
+            return -1
+        elif k == "up":
+            self.sel = max(0, self.sel - 1)
+        elif k == "down":
+            self.sel = max(0, min(n - 1, self.sel + 1))
+        elif k == "pgup":
+            self.sel = max(0, self.sel - self.rows)
+        elif k == "pgdw":
+            self.sel = max(0, min(n - 1, self.sel + self.rows))
+        elif k == "home":
+            self.sel = 0
+        elif k == "end":
+            self.sel = max(0, n - 1)
+        elif k == "bck":
+            if self.flt:
+                self.set_filter(self.flt[:-1])
+        elif len(k) == 1:
+            self.set_filter(self.flt + k)
+        self._visible()
+        return None
+
+    def render(self, full=False) -> None:
+        """
+        Draw the rows that changed since the last render.
+        Pass full=True to redraw everything (after a clear for example).
+        """
+        if full:
+            self._drawn = [None] * (self.rows + 1)
+        jc = self.jc
+        hold = jc.hold_stdout
+        jc.hold_stdout = True
+        try:
+            n = len(self.match)
+            for i in range(self.rows):
+                pos = self.scroll + i
+                if pos < n:
+                    row = (self._row_text(self._text(self.match[pos])), pos == self.sel)
+                else:
+                    row = ("", False)
+                if row != self._drawn[i]:
+                    self._draw(i, row[0], row[1])
+                    self._drawn[i] = row
+            row = (self._row_text(f"/{self.flt} [{n}/{len(self.items)}]"), False)
+            if row != self._drawn[self.rows]:
+                self._draw(self.rows, row[0], False)
+                self._drawn[self.rows] = row
+        finally:
+            jc.hold_stdout = hold
+        jc.flush_writes()
+
+    def _draw(self, i, text, sel) -> None:
+        self.jc.move(x=self.left, y=self.top + i)
+        if sel:
+            self.jc.nwrite(f"{ESCK}7m{text}{ESCK}0m{' ' * (self.width - len(text))}")
+        else:
+            self.jc.nwrite(text + " " * (self.width - len(text)))
+
+    def run(self):
+        """
+        Blocking menu loop.
+        Returns the selected index into items, or -1 if cancelled.
+        """
+        self.render(full=True)
+        while True:
+            keys = self.jc.register_char()
+            if not keys:
+                sleep(0.01)
+                continue
+            for i in range(len(keys)):
+                res = self.key(keys[i])
+                if res is not None:
+                    # Leave the rest to whoever reads next
+                    for k in reversed(keys[i + 1 :]):
+                        self.jc.events.push_back(k)
+                    return res
+            self.render()
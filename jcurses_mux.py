@@ -0,0 +1,152 @@
+from jcurses_writer import jcurses_writer
+
+
+def strip_csi(keep=b""):
+    """
+    Make a sink filter that drops the ansi CSI sequences a console can't handle.
+
+    keep : Final bytes of the sequences to let through, for example b"HJK".
+
+    Sequences are expected to arrive whole within one write,
+    which is how jcurses always sends them.
+    """
+    keep = bytes(keep)
+
+    def filt(data):
+        if 27 not in data:
+            return data
+        res = bytearray()
+        i = 0
+        n = len(data)
+        while i < n:
+            j = data.find(b"\x1b[", i)
+            if j == -1:
+                res += data[i:]
+                break
+            res += data[i:j]
+            k = j + 2
+            while k < n and not (64 <= data[k] <= 126):
+                k += 1
+            if k < n and data[k] in keep:
+                res += data[j : k + 1]
+            i = k + 1
+        return bytes(res)
+
+    return filt
+
+
+class jcurses_mux:
+    def __init__(self, console):
+        """
+        Output fan-out & input merge over several consoles.
+
+        console is the primary one, anything not handled here
+        (size, display, ...) comes from it.
+        Every write is encoded once by jcurses and the same bytes go to all sinks.
+        """
+        self.console = console
+        self._sinks = [[console, console, None]]  # [console, writer, filter]
+        self._sources = [console]
+        self._next = 0  # Source to read from first, so no one starves
+
+    def __getattr__(self, name):
+        return getattr(self.console, name)
+
+    def add(
+        self, console, filt=None, queued=False, max_bytes=8192, block=True, inp=True
+    ):
+        """
+        Mirror the session to another console.
+
+        filt      : Callable taking & returning bytes, see strip_csi.
+        queued    : Write through a jcurses_writer, a slow sink won't hold the rest.
+        max_bytes : Queue size for queued sinks.
+        block     : When the queue is full, wait (True) or drop the new data (False).
+        inp       : Also read input from it.
+        """
+        sink = console
+        if queued:
+            sink = jcurses_writer(console, max_bytes, block)
+        self._sinks.append([console, sink, filt])
+        if inp:
+            self._sources.append(console)
+        return sink
+
+    def remove(self, console) -> None:
+        for i in self._sinks:
+            if i[0] is console:
+                if i[1] is not console:
+                    i[1].close()
+                self._sinks.remove(i)
+                break
+        if console in self._sources:
+            self._sources.remove(console)
+        self._next = 0
+
+    def write(self, data) -> None:
+        done = {}  # Filters shared between sinks only run once
+        for console, sink, filt in self._sinks:
+            out = data
+            if filt is not None:
+                if filt in done:
+                    out = done[filt]
+                else:
+                    out = filt(data)
+                    done[filt] = out
+            if len(out):
+                sink.write(out)
+
+    def drain(self, timeout=None) -> bool:
+        res = True
+        for i in self._sinks:
+            if hasattr(i[1], "drain"):
+                res = i[1].drain(timeout) and res
+        return res
+
+    @property
+    def in_waiting(self) -> int:
+        res = 0
+        for i in self._sources:
+            res += i.in_waiting
+        return res
+
+    def read(self, n=1) -> bytes:
+        res = b""
+        cnt = len(self._sources)
+        for i in range(cnt):
+            src = self._sources[(self._next + i) % cnt]
+            m = src.in_waiting
+            if m:
+                res += src.read(min(m, n - len(res)))
+                if len(res) >= n:
+                    self._next = (self._next + i + 1) % cnt
+                    break
+        return res
+
+    def reset_input_buffer(self) -> None:
+        for i in self._sources:
+            if hasattr(i, "reset_input_buffer"):
+                i.reset_input_buffer()
+
+    @property
+    def out_waiting(self) -> int:
+        res = 0
+        for i in self._sinks:
+            if hasattr(i[1], "out_waiting"):
+                res += i[1].out_waiting
+        return res
+
+    def reset_output_buffer(self) -> None:
+        for i in self._sinks:
+            if hasattr(i[1], "reset_output_buffer"):
+                i[1].reset_output_buffer()
+
+    @property
+    def connected(self) -> bool:
+        res = None
+        for i in self._sources:
+            if hasattr(i, "connected"):
+                res = res or i.connected
+        if res is None:
+            raise AttributeError("connected")
+        return res
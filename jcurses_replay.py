@@ -0,0 +1,181 @@
+from struct import pack, unpack, calcsize
+from time import sleep
+
+try:
+    from time import monotonic_ns
+
+    def _now_us() -> int:
+        return monotonic_ns() // 1000
+
+except ImportError:
+    from time import monotonic
+
+    def _now_us() -> int:
+        return int(monotonic() * 1000000)
+
+
+# Session file layout:
+#     header : b"JCR1", rows, columns (0 if the console had no size), flags
+#              flags bit 0: the console had .connected
+#     records: kind (b"i" input / b"o" output), microseconds since the last record,
+#              length, data
+_MAGIC = b"JCR1"
+_HEAD = "<HHB"
+_REC = "<cII"
+
+
+class jcurses_recorder:
+    def __init__(self, console, path):
+        """
+        Wraps a console & logs all input and output with timestamps to path.
+        Everything else is passed through to the wrapped console.
+        """
+        self.console = console
+        self._f = open(path, "wb")
+        size = [0, 0]
+        if hasattr(console, "size"):
+            size = console.size
+        self._f.write(
+            _MAGIC + pack(_HEAD, size[0], size[1], hasattr(console, "connected"))
+        )
+        self._last = _now_us()
+
+    def __getattr__(self, name):
+        return getattr(self.console, name)
+
+    def _log(self, kind, data) -> None:
+        now = _now_us()
+        self._f.write(pack(_REC, kind, min(now - self._last, 0xFFFFFFFF), len(data)))
+        self._f.write(data)
+        self._last = now
+
+    def read(self, n=1) -> bytes:
+        data = self.console.read(n)
+        if data:
+            self._log(b"i", data)
+        return data
+
+    def write(self, data):
+        self._log(b"o", data)
+        return self.console.write(data)
+
+    def close(self) -> None:
+        self._f.close()
+
+
+class jcurses_replayer:
+    def __init__(self, path, realtime=False):
+        """
+        A console that plays back the input of a recorded session
+        & collects what jcurses writes, to compare against the recording.
+
+        realtime : Feed input at the recorded pace, otherwise as fast as possible.
+            Either way input comes in the same chunks it was read in.
+        """
+        self.realtime = realtime
+        self._input = []  # [microseconds since start, data]
+        expected = []
+        with open(path, "rb") as f:
+            if f.read(len(_MAGIC)) != _MAGIC:
+                raise ValueError("Not a jcurses session")
+            rows, cols, flags = unpack(_HEAD, f.read(calcsize(_HEAD)))
+            t = 0
+            while True:
+                rec = f.read(calcsize(_REC))
+                if len(rec) < calcsize(_REC):
+                    break
+                kind, dt, n = unpack(_REC, rec)
+                data = f.read(n)
+                t += dt
+                if kind == b"i":
+                    self._input.append([t, data])
+                else:
+                    expected.append(data)
+        self.expected = b"".join(expected)
+        self.output = bytearray()
+        self._size = [rows, cols] if rows else None
+        self._conn = bool(flags & 1)
+        self._i = 0  # Current input chunk
+        self._pos = 0  # Position in it
+        self._start = None
+        self.elapsed = 0  # Seconds spent in the last run
+
+    def __getattr__(self, name):
+        # Only show what the recorded console had.
+        if name == "size" and self._size is not None:
+            return self._size
+        if name == "connected" and self._conn:
+            return not self.done
+        raise AttributeError(name)
+
+    @property
+    def done(self) -> bool:
+        return self._i >= len(self._input)
+
+    @property
+    def in_waiting(self) -> int:
+        if self.done:
+            return 0
+        if self.realtime:
+            if self._start is None:
+                self._start = _now_us()
+            if _now_us() - self._start < self._input[self._i][0]:
+                return 0
+        return len(self._input[self._i][1]) - self._pos
+
+    def read(self, n=1) -> bytes:
+        if not self.in_waiting:
+            return b""
+        chunk = self._input[self._i][1]
+        res = chunk[self._pos : self._pos + n]
+        self._pos += len(res)
+        if self._pos >= len(chunk):
+            self._i += 1
+            self._pos = 0
+        return res
+
+    def write(self, data) -> None:
+        self.output += data
+
+    def reset_input_buffer(self) -> None:
+        # The recording only has what was read after the reset.
+        pass
+
+    def reset_output_buffer(self) -> None:
+        pass
+
+    def rewind(self) -> None:
+        self._i = 0
+        self._pos = 0
+        self._start = None
+        self.output = bytearray()
+
+    def compare(self) -> int:
+        """
+        Returns -1 if the output matches the recording byte for byte,
+        otherwise the offset of the first difference.
+        """
+        n = min(len(self.output), len(self.expected))
+        for i in range(n):
+            if self.output[i] != self.expected[i]:
+                return i
+        if len(self.output) != len(self.expected):
+            return n
+        return -1
+
+    def run(self, fn, *args) -> int:
+        """
+        Call fn (like jcurses.program or jcurses.input) until all input is used up,
+        then compare the output. Time taken ends up in self.elapsed.
+
+        The recording has to end where fn returns, input() for example
+        never returns on its own without an enter.
+        """
+        self.rewind()
+        st = _now_us()
+        while not self.done:
+            fn(*args)
+            if self.realtime and not self.done:
+                sleep(0.001)
+        self.elapsed = (_now_us() - st) / 1000000
+        return self.compare()
@@ -0,0 +1,138 @@
+import os
+import termios
+import tty
+from fcntl import ioctl
+from select import select
+from struct import pack, unpack
+
+# Host only (Linux & friends), CircuitPython uses its own console objects.
+_IOV_MAX = 1024
+
+
+class jcurses_tty:
+    def __init__(self, fd=None, raw=True, bufsize=4096):
+        """
+        Console backend for a tty or pty on the host.
+
+        fd      : An open file descriptor or a device path, defaults to /dev/tty.
+        raw     : Put the terminal in raw mode, restored on close.
+        bufsize : Size of the reusable read buffer, the most one read returns.
+        """
+        self._own = False  # We opened it, so we close it
+        if fd is None:
+            fd = "/dev/tty"
+        if isinstance(fd, str):
+            fd = os.open(fd, os.O_RDWR | os.O_NOCTTY)
+            self._own = True
+        self.fd = fd
+        self._buf = bytearray(bufsize)
+        self._mv = memoryview(self._buf)
+        self._saved = None  # termios settings before raw mode
+        if raw:
+            self.raw()
+        self._blocking = os.get_blocking(fd)  # Put back on close
+        os.set_blocking(fd, False)
+
+    @classmethod
+    def openpty(cls, raw=True, bufsize=4096):
+        """
+        Make a pty pair. Returns (console on the slave side, master fd).
+        Whatever drives the session (a socket bridge, a test, ...) uses the master.
+        """
+        master, slave = os.openpty()
+        res = cls(slave, raw, bufsize)
+        res._own = True
+        return res, master
+
+    def raw(self) -> None:
+        if self._saved is None:
+            self._saved = termios.tcgetattr(self.fd)
+        tty.setraw(self.fd, termios.TCSADRAIN)
+
+    def restore(self) -> None:
+        if self._saved is not None:
+            termios.tcsetattr(self.fd, termios.TCSADRAIN, self._saved)
+            self._saved = None
+
+    def close(self) -> None:
+        if self.fd is None:
+            return
+        try:
+            self.restore()
+        finally:
+            os.set_blocking(self.fd, self._blocking)
+            if self._own:
+                os.close(self.fd)
+            self.fd = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def _ioctl_int(self, req) -> int:
+        return unpack("i", ioctl(self.fd, req, b"\0\0\0\0"))[0]
+
+    @property
+    def in_waiting(self) -> int:
+        return self._ioctl_int(termios.FIONREAD)
+
+    @property
+    def out_waiting(self) -> int:
+        return self._ioctl_int(termios.TIOCOUTQ)
+
+    @property
+    def size(self) -> list:
+        """
+        [rows, collumns] from the kernel, no terminal round-trip needed.
+        """
+        rows, cols = unpack("HHHH", ioctl(self.fd, termios.TIOCGWINSZ, bytes(8)))[:2]
+        if not rows:
+            # Nobody set it (a fresh pty), let jcurses ask the terminal.
+            raise AttributeError("size")
+        return [rows, cols]
+
+    @size.setter
+    def size(self, size) -> None:
+        ioctl(self.fd, termios.TIOCSWINSZ, pack("HHHH", size[0], size[1], 0, 0))
+
+    def readinto(self, buf) -> int:
+        """
+        Read what's there into buf, returns the count.
+        """
+        try:
+            return os.readv(self.fd, [buf])
+        except BlockingIOError:
+            return 0
+
+    def read(self, n=1) -> bytes:
+        n = min(n, len(self._buf))
+        return bytes(self._mv[: self.readinto(self._mv[:n])])
+
+    def write(self, data) -> None:
+        self.writev([data])
+
+    def writev(self, bufs) -> None:
+        """
+        Write all of bufs with as few syscalls as possible.
+        """
+        bufs = [memoryview(i) for i in bufs]
+        while bufs:
+            try:
+                n = os.writev(self.fd, bufs[:_IOV_MAX])
+            except BlockingIOError:
+                select([], [self.fd], [])
+                continue
+            # Drop what went out, keep the rest of a partial write
+            while bufs and n >= len(bufs[0]):
+                n -= len(bufs[0])
+                bufs.pop(0)
+            if n:
+                bufs[0] = bufs[0][n:]
+
+    def reset_input_buffer(self) -> None:
+        termios.tcflush(self.fd, termios.TCIFLUSH)
+
+    def reset_output_buffer(self) -> None:
+        termios.tcflush(self.fd, termios.TCOFLUSH)
@@ -0,0 +1,135 @@
+try:
+    from threading import Thread, Condition
+except ImportError:
+    # CircuitPython, writes stay synchronous.
+    Thread = None
+
+
+class jcurses_writer:
+    def __init__(self, console, max_bytes=8192, block=True):
+        """
+        Output backend that hands the writes to a background thread.
+
+        Wrap the console with it, `jcurses.console = jcurses_writer(console)`,
+        and all writes return as soon as the data is queued.
+        Everything else is passed through to the wrapped console.
+
+        max_bytes : How much may be queued before write has to wait.
+        block     : When full, wait (True) or drop the new data (False).
+        """
+        self.console = console
+        self.max_bytes = max_bytes
+        self.block = block
+        self.dropped = 0  # Bytes thrown away while full with block=False
+
+        self._chunks = []
+        self._queued = 0
+        self._busy = False  # The thread is writing
+        self._closed = False
+        self._error = None  # Raised back at the next write / drain
+        self._cond = None
+        self._thread = None
+        if Thread is not None:
+            self._cond = Condition()
+            self._thread = Thread(target=self._loop)
+            self._thread.daemon = True
+            self._thread.start()
+
+    def __getattr__(self, name):
+        return getattr(self.console, name)
+
+    def write(self, data) -> None:
+        if self._cond is None:
+            self.console.write(data)
+            return
+        data = bytes(data)  # The caller may reuse their buffer
+        with self._cond:
+            self._raise()
+            while self._queued and self._queued + len(data) > self.max_bytes:
+                if not self.block:
+                    self.dropped += len(data)
+                    return
+                self._cond.wait()
+                self._raise()
+            self._chunks.append(data)
+            self._queued += len(data)
+            self._cond.notify_all()
+
+    def drain(self, timeout=None) -> bool:
+        """
+        Wait until everything queued has been written.
+        Returns False if the timeout ran out first.
+        """
+        if self._cond is None:
+            return True
+        with self._cond:
+            res = self._cond.wait_for(
+                lambda: not (self._chunks or self._busy) or self._error is not None,
+                timeout,
+            )
+            self._raise()
+        return res
+
+    @property
+    def out_waiting(self) -> int:
+        res = self._queued
+        if hasattr(self.console, "out_waiting"):
+            res += self.console.out_waiting
+        return res
+
+    def reset_output_buffer(self) -> None:
+        if self._cond is not None:
+            with self._cond:
+                self._chunks = []
+                self._queued = 0
+                self._cond.notify_all()
+        if hasattr(self.console, "reset_output_buffer"):
+            self.console.reset_output_buffer()
+
+    def close(self) -> None:
+        """
+        Write out what is left and stop the thread.
+        """
+        if self._cond is None:
+            return
+        try:
+            self.drain()
+        finally:
+            # Stop the thread even if the console failed
+            with self._cond:
+                self._closed = True
+                self._cond.notify_all()
+            self._thread.join()
+
+    def _raise(self) -> None:
+        if self._error is not None:
+            err = self._error
+            self._error = None
+            raise err
+
+    def _loop(self) -> None:
+        while True:
+            with self._cond:
+                while not (self._chunks or self._closed):
+                    self._cond.wait()
+                if not self._chunks:
+                    return
+                # Coalesce whatever piled up into one write
+                chunks = self._chunks
+                self._chunks = []
+                self._queued = 0
+                self._busy = True
+                self._cond.notify_all()
+            try:
+                if len(chunks) == 1:
+                    self.console.write(chunks[0])
+                elif hasattr(self.console, "writev"):
+                    self.console.writev(chunks)
+                else:
+                    self.console.write(b"".join(chunks))
+            except Exception as err:
+                self._error = err
+            del chunks
+            with self._cond:
+                self._busy = False
+                self._cond.notify_all()